@@ -4,20 +4,43 @@ Football Stats Web App
 A beautiful interface to fetch and download football statistics for Europe's top 5 leagues.
 """
 
-from flask import Flask, render_template, request, Response, jsonify, stream_with_context
-from io import StringIO
+from flask import Flask, render_template, request, Response, stream_with_context
+from collections import OrderedDict
+from pathlib import Path
+import functools
+import gzip
+import hashlib
 import json
+import threading
 import time
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
 # Lazy load heavy modules
 _sd = None
+_sd_error = None
 _pd = None
 
 def get_soccerdata():
-    global _sd
+    global _sd, _sd_error
     if _sd is None:
-        import soccerdata as sd
+        # A failed import is not cached by Python, so remember it ourselves
+        if _sd_error is not None:
+            raise ImportError(_sd_error)
+        try:
+            import soccerdata as sd
+        except Exception as e:
+            _sd_error = f"soccerdata could not be imported: {e}"
+            raise ImportError(_sd_error) from e
         _sd = sd
     return _sd
 
@@ -28,12 +51,56 @@ def get_pandas():
         _pd = pd
     return _pd
 
+def warm_imports():
+    """Import the heavy modules in the background so the first API call finds them loaded."""
+    try:
+        get_soccerdata()
+        get_pandas()
+    except Exception as e:
+        print(f"Error warming imports: {e}")
+
+threading.Thread(target=warm_imports, daemon=True).start()
+
+def dumps_json(obj) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str).encode("utf-8")
+
+
+def dumps_json_with(obj: dict, **encoded: bytes) -> bytes:
+    """Serialize a non-empty dict and append fields whose values are already JSON bytes."""
+    body = dumps_json(obj)[:-1]
+    for key, value in encoded.items():
+        body += b',"' + key.encode("utf-8") + b'":' + value
+    return body + b"}"
+
+
+def json_response(obj, status: int = 200, headers: dict = None):
+    """Build a JSON response from an already-known payload."""
+    return Response(dumps_json(obj), status=status, mimetype="application/json", headers=headers)
+
+
+def sse_event(obj, **encoded: bytes) -> bytes:
+    """Encode a payload, plus any pre-encoded JSON fields, as a Server-Sent Events data frame."""
+    body = dumps_json_with(obj, **encoded) if encoded else dumps_json(obj)
+    return b"data: " + body + b"\n\n"
+
 app = Flask(__name__)
 
+# Compress JSON, CSV and HTML responses when flask-compress is installed.
+# The progress stream is left out: compressing it would buffer the events.
+if Compress is not None:
+    app.config["COMPRESS_MIMETYPES"] = ["application/json", "text/csv", "text/html"]
+    app.config["COMPRESS_LEVEL"] = 6
+    app.config["COMPRESS_MIN_SIZE"] = 1024
+    app.config["COMPRESS_STREAMS"] = True
+    Compress(app)
+
 # Health check endpoint
 @app.route("/health")
 def health():
-    return jsonify({"status": "ok", "message": "Server is running"})
+    return json_response({"status": "ok", "message": "Server is running"})
 
 # League identifiers for soccerdata
 LEAGUES = {
@@ -44,6 +111,9 @@ LEAGUES = {
     "ligue1": {"name": "Ligue 1", "country": "France", "id": "FRA-Ligue 1", "flag": "🇫🇷"},
 }
 
+# Flat league key -> soccerdata id lookup for the backend
+LEAGUE_IDS = {key: league["id"] for key, league in LEAGUES.items()}
+
 # Available seasons (recent ones)
 SEASONS = [
     {"value": "2425", "label": "2024-25"},
@@ -107,44 +177,196 @@ DATA_TYPES = {
 }
 
 
+# Serialized /api/stats payloads, built once since DATA_TYPES never changes
+_STATS_JSON = {key: dumps_json(dt["stats"]) for key, dt in DATA_TYPES.items()}
+
+
+# Scraper instances reused across requests, keyed by league and season sets
+FBREF_POOL_SIZE = 32
+_fbref_pool = OrderedDict()
+_fbref_pool_lock = threading.Lock()
+
+
 def get_fbref_scraper(leagues: list[str], seasons: list[str]):
-    """Create an FBref scraper instance."""
-    league_ids = [LEAGUES[lg]["id"] for lg in leagues if lg in LEAGUES]
+    """Get a pooled FBref scraper instance for these leagues and seasons."""
+    league_ids = [LEAGUE_IDS[lg] for lg in leagues if lg in LEAGUE_IDS]
     if not league_ids:
         raise ValueError("No valid leagues provided")
+    key = (frozenset(league_ids), frozenset(seasons))
+    
+    with _fbref_pool_lock:
+        fbref = _fbref_pool.get(key)
+        if fbref is not None:
+            _fbref_pool.move_to_end(key)
+            return fbref
+    
     sd = get_soccerdata()
-    return sd.FBref(leagues=league_ids, seasons=seasons)
+    fbref = sd.FBref(leagues=league_ids, seasons=seasons)
+    
+    with _fbref_pool_lock:
+        # Another thread may have built one meanwhile; keep the first
+        fbref = _fbref_pool.setdefault(key, fbref)
+        _fbref_pool.move_to_end(key)
+        while len(_fbref_pool) > FBREF_POOL_SIZE:
+            _fbref_pool.popitem(last=False)
+    return fbref
 
 
-def fetch_data(data_type: str, leagues: list[str], seasons: list[str], stat_type: str = None, teams: list[str] = None):
-    """Fetch data based on parameters."""
+# Rows per chunk when streaming CSV downloads
+CSV_CHUNK_ROWS = 10000
+
+# Rows shown in the preview table
+PREVIEW_ROWS = 20
+
+
+def read_data(data_type: str, leagues: list[str], seasons: list[str], stat_type: str = None):
+    """Scrape one data type from FBref."""
     fbref = get_fbref_scraper(leagues, seasons)
     
     if data_type == "team":
-        df = fbref.read_team_season_stats(stat_type=stat_type or "standard")
+        return fbref.read_team_season_stats(stat_type=stat_type or "standard")
     elif data_type == "player":
-        df = fbref.read_player_season_stats(stat_type=stat_type or "standard")
+        return fbref.read_player_season_stats(stat_type=stat_type or "standard")
     elif data_type == "schedule":
-        df = fbref.read_schedule()
+        return fbref.read_schedule()
     elif data_type == "player_match":
-        df = fbref.read_player_match_stats(stat_type=stat_type or "summary")
-    else:
-        raise ValueError(f"Unknown data type: {data_type}")
+        return fbref.read_player_match_stats(stat_type=stat_type or "summary")
+    raise ValueError(f"Unknown data type: {data_type}")
+
+
+# On-disk copies of scraped frames, shared by workers and kept across restarts
+DISK_CACHE_DIR = Path(os.environ.get("SPORTSDATA_CACHE_DIR", Path.home() / ".cache" / "sportsdata"))
+DISK_CACHE_TTL = 24 * 60 * 60
+# Expired files are swept from the directory at most this often per process
+DISK_CACHE_SWEEP_INTERVAL = 60 * 60
+_last_disk_sweep = 0.0
+_disk_sweep_lock = threading.Lock()
+
+
+def disk_cache_path(key: tuple) -> Path:
+    """Cache file for a fetch key."""
+    digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+    return DISK_CACHE_DIR / f"{digest}.pkl"
+
+
+def read_disk_cache(key: tuple):
+    """Load the frame cached for key, or None if it is missing or stale."""
+    path = disk_cache_path(key)
+    try:
+        if time.time() - path.stat().st_mtime < DISK_CACHE_TTL:
+            return get_pandas().read_pickle(path)
+        path.unlink(missing_ok=True)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error reading cache file {path}: {e}")
+    return None
+
+
+def write_disk_cache(key: tuple, df):
+    """Store a frame for key, replacing any previous file atomically."""
+    path = disk_cache_path(key)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        DISK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Error writing cache file {path}: {e}")
+    sweep_disk_cache()
+
+
+def sweep_disk_cache():
+    """Delete expired cache files (and temp files orphaned by crashed writers)."""
+    global _last_disk_sweep
+    now = time.time()
+    with _disk_sweep_lock:
+        if now - _last_disk_sweep < DISK_CACHE_SWEEP_INTERVAL:
+            return
+        _last_disk_sweep = now
+    for pattern in ("*.pkl", "*.tmp"):
+        for path in DISK_CACHE_DIR.glob(pattern):
+            try:
+                if now - path.stat().st_mtime >= DISK_CACHE_TTL:
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error removing cache file {path}: {e}")
+
+
+# Repeated label columns stored as pandas categoricals
+CATEGORY_COLUMNS = ("team", "league", "season", "home_team", "away_team")
+
+
+def categorize_columns(df):
+    """Store repeated label columns as categoricals (codes plus one copy of each name)."""
+    if df.columns.nlevels == 1:
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns and df[col].dtype != "category":
+                df[col] = df[col].astype("category")
+    return df
+
+
+# Recently scraped frames, keyed by (data_type, leagues, seasons, stat_type)
+FETCH_CACHE_TTL = 30 * 60
+FETCH_CACHE_SIZE = 64
+_fetch_cache = OrderedDict()
+_fetch_cache_lock = threading.Lock()
+
+
+def fetch_cached(data_type: str, leagues: tuple, seasons: tuple, stat_type: str = None):
+    """Scrape data, reusing a recent result for the same request shape.
+
+    League and season order doesn't matter, so both are sorted into the key.
+    Returns a shallow copy so callers can rename columns without touching the cache.
+    """
+    if data_type == "schedule":
+        stat_type = None
+    key = (data_type, tuple(sorted(set(leagues))), tuple(sorted(set(seasons))), stat_type)
+    leagues, seasons = key[1], key[2]
+    now = time.monotonic()
+    
+    with _fetch_cache_lock:
+        hit = _fetch_cache.get(key)
+        if hit and now - hit[0] < FETCH_CACHE_TTL:
+            _fetch_cache.move_to_end(key)
+            return hit[1].copy(deep=False)
+    
+    df = read_disk_cache(key)
+    if df is None:
+        df = categorize_columns(read_data(data_type, list(leagues), list(seasons), stat_type))
+        write_disk_cache(key, df)
+    
+    with _fetch_cache_lock:
+        _fetch_cache[key] = (now, df)
+        _fetch_cache.move_to_end(key)
+        while len(_fetch_cache) > FETCH_CACHE_SIZE:
+            _fetch_cache.popitem(last=False)
+    return df.copy(deep=False)
+
+
+def fetch_data(data_type: str, leagues: list[str], seasons: list[str], stat_type: str = None, teams: list[str] = None,
+               columns: list[str] = None):
+    """Fetch data based on parameters."""
+    df = fetch_cached(data_type, tuple(leagues), tuple(seasons), stat_type)
     
     # Filter by teams if specified
     if teams and len(teams) > 0:
         df = filter_by_teams(df, teams)
     
+    # Drop unrequested columns once the team filter has used home_team/away_team
+    if columns:
+        df = select_columns(df, columns)
+    
     return df
 
 
 def filter_by_teams(df, teams: list[str]):
     """Filter DataFrame by team names."""
     if df.index.names and 'team' in df.index.names:
-        # Team is in the index
-        df = df.reset_index()
-        df = df[df['team'].isin(teams)]
-        return df
+        # Team is in the index: mask on that level rather than resetting the index
+        return df[df.index.get_level_values('team').isin(teams)]
     elif 'team' in df.columns:
         return df[df['team'].isin(teams)]
     elif 'home_team' in df.columns and 'away_team' in df.columns:
@@ -153,33 +375,265 @@ def filter_by_teams(df, teams: list[str]):
     return df
 
 
+def flat_column_names(columns):
+    """Join the levels of a MultiIndex into 'Level 0 - Level 1' names."""
+    levels = [columns.get_level_values(i).astype(str) for i in range(columns.nlevels)]
+    return levels[0].str.cat(levels[1:], sep=" - ").str.strip(" - ")
+
+
+def flatten_columns(df):
+    """Flatten MultiIndex columns into 'Level 0 - Level 1' names."""
+    if df.columns.nlevels > 1:
+        df.columns = flat_column_names(df.columns)
+    return df
+
+
+def select_columns(df, columns: list[str]):
+    """Keep only the requested columns, matched by flattened name or by last header level."""
+    wanted = df.columns.get_level_values(-1).isin(columns)
+    if df.columns.nlevels > 1:
+        wanted |= flat_column_names(df.columns).isin(columns)
+    return df.loc[:, wanted]
+
+
+def reset_index(df):
+    """Move index levels into columns, unless the index is just a row counter."""
+    if isinstance(df.index, get_pandas().RangeIndex):
+        return df
+    return df.reset_index()
+
+
+def preview_json(df, n: int = PREVIEW_ROWS) -> bytes:
+    """First n rows as a JSON array of row arrays, serialized by pandas."""
+    return df.head(n).to_json(orient="values", date_format="iso", default_handler=str).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=256)
+def team_names(league: str, season: str, ttl_bucket: int) -> tuple:
+    """Sorted team names for a league and season. Failures and empty lists raise and are not cached.
+
+    ttl_bucket changes every FETCH_CACHE_TTL seconds, so entries expire with the fetch cache.
+    """
+    df = fetch_cached("team", (league,), (season,), "standard")
+    
+    # Extract team names from index
+    if df.index.names and 'team' in df.index.names:
+        teams = df.index.get_level_values('team').unique().tolist()
+    elif 'team' in df.columns:
+        teams = df['team'].unique().tolist()
+    else:
+        teams = []
+    
+    if not teams:
+        raise ValueError(f"No teams found for {league} {season}")
+    return tuple(sorted(teams))
+
+
 def get_teams_for_league(league: str, season: str) -> list[str]:
     """Get list of teams for a specific league and season."""
     try:
-        fbref = get_fbref_scraper([league], [season])
-        df = fbref.read_team_season_stats(stat_type="standard")
-        
-        # Extract team names from index
-        if df.index.names and 'team' in df.index.names:
-            teams = df.index.get_level_values('team').unique().tolist()
-        elif 'team' in df.columns:
-            teams = df['team'].unique().tolist()
-        else:
-            teams = []
-        
-        return sorted(teams)
+        return list(team_names(league, season, int(time.monotonic() // FETCH_CACHE_TTL)))
     except Exception as e:
         print(f"Error fetching teams: {e}")
         return []
 
 
+# League/season pairs primed in the background at startup (SPORTSDATA_WARMUP=0 disables).
+# Only one worker per cache directory runs it; the others pick the frames up from disk.
+# The lock reads "<owner> running" while a warm-up is under way and "<owner> done" after
+# it succeeds; a failed warm-up removes it so the next worker to start tries again.
+WARMUP_COMBOS = [(league, season) for league in ("epl", "laliga", "bundesliga") for season in ("2324", "2425")]
+WARMUP_CONCURRENCY = 2
+WARMUP_LOCK = DISK_CACHE_DIR / "warmup.lock"
+# A "running" lock older than this belongs to a worker that died mid warm-up
+WARMUP_TIMEOUT = 30 * 60
+_warmup_slots = threading.BoundedSemaphore(WARMUP_CONCURRENCY)
+
+
+def read_warmup_lock():
+    """(owner, finished, age in seconds) of the warm-up lock, or None if there is none."""
+    try:
+        owner, _, state = WARMUP_LOCK.read_text().partition(" ")
+        return owner, state == "done", time.time() - WARMUP_LOCK.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def write_warmup_lock(owner: str, state: str):
+    """Point the lock at owner in one os.replace, from a temp file only this process writes."""
+    tmp_path = WARMUP_LOCK.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(f"{owner} {state}")
+    os.replace(tmp_path, WARMUP_LOCK)
+
+
+def claim_warmup():
+    """Take the warm-up lock. Returns an owner token, or None if another worker holds it."""
+    owner = os.urandom(8).hex()
+    try:
+        DISK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        try:
+            with os.fdopen(os.open(WARMUP_LOCK, os.O_CREAT | os.O_EXCL | os.O_WRONLY), "w") as f:
+                f.write(f"{owner} running")
+            return owner
+        except FileExistsError:
+            pass
+        lock = read_warmup_lock()
+        if lock is not None:
+            _, finished, age = lock
+            if age < (DISK_CACHE_TTL if finished else WARMUP_TIMEOUT):
+                return None
+        # Stale: the frames it warmed have expired too (or its worker died), so take it
+        # over, then read it back in case another worker replaced it at the same moment
+        write_warmup_lock(owner, "running")
+        lock = read_warmup_lock()
+        return owner if lock is not None and lock[0] == owner else None
+    except OSError as e:
+        print(f"Error claiming warm-up lock {WARMUP_LOCK}: {e}")
+        return None
+
+
+def finish_warmup(owner: str, succeeded: bool):
+    """Mark the lock done (restarting its TTL), or remove it so a later worker retries."""
+    try:
+        lock = read_warmup_lock()
+        if lock is None or lock[0] != owner:
+            return
+        if succeeded:
+            write_warmup_lock(owner, "done")
+        else:
+            WARMUP_LOCK.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"Error updating warm-up lock {WARMUP_LOCK}: {e}")
+
+
+def warm_cache(league: str, season: str) -> bool:
+    """Prime the team list, and with it the team standard stats frame, for one pair."""
+    with _warmup_slots:
+        return bool(get_teams_for_league(league, season))
+
+
+def run_warmup(owner: str):
+    """Warm every pair concurrently, then settle the lock on the outcome."""
+    results = [False] * len(WARMUP_COMBOS)
+    
+    def warm(i, league, season):
+        results[i] = warm_cache(league, season)
+    
+    threads = [threading.Thread(target=warm, args=(i, league, season), daemon=True)
+               for i, (league, season) in enumerate(WARMUP_COMBOS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    finish_warmup(owner, all(results))
+
+
+if os.environ.get("SPORTSDATA_WARMUP", "1") != "0":
+    _warmup_owner = claim_warmup()
+    if _warmup_owner is not None:
+        threading.Thread(target=run_warmup, args=(_warmup_owner,), daemon=True).start()
+
+
+def render_index() -> bytes:
+    """Render the main page. Its inputs are module constants, so this runs once."""
+    with app.app_context():
+        html = render_template("index.html",
+                               leagues=LEAGUES,
+                               seasons=SEASONS,
+                               data_types=DATA_TYPES)
+    return html.encode("utf-8")
+
+
+# Pre-rendered main page, served verbatim on every request
+_INDEX_HTML = render_index()
+_INDEX_HTML_GZIP = gzip.compress(_INDEX_HTML, compresslevel=9)
+
+# The page only changes on deploy, so a content hash makes a stable ETag
+_INDEX_ETAG = hashlib.sha256(_INDEX_HTML).hexdigest()[:16]
+_INDEX_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=86400"
+_INDEX_VARIANTS = {
+    "gzip": (_INDEX_HTML_GZIP, {
+        "Content-Encoding": "gzip",
+        "Vary": "Accept-Encoding",
+        "ETag": f'"{_INDEX_ETAG}-gzip"',
+        "Cache-Control": _INDEX_CACHE_CONTROL,
+    }),
+    "identity": (_INDEX_HTML, {
+        "Vary": "Accept-Encoding",
+        "ETag": f'"{_INDEX_ETAG}"',
+        "Cache-Control": _INDEX_CACHE_CONTROL,
+    }),
+}
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip; q=0 refuses a coding."""
+    wildcard = False
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding in ("gzip", "x-gzip"):
+            # An explicit entry overrides any wildcard
+            return quality > 0
+        if coding == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether If-None-Match is '*' or lists etag (weak comparison, so W/ is ignored)."""
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def index_payload(accept_encoding: str, if_none_match: str):
+    """Pick the status, body and headers for the pre-rendered main page."""
+    body, headers = _INDEX_VARIANTS["gzip" if accepts_gzip(accept_encoding) else "identity"]
+    if etag_matches(if_none_match, headers["ETag"]):
+        return 304, b"", headers
+    return 200, body, headers
+
+
 @app.route("/")
 def index():
     """Render the main page."""
-    return render_template("index.html", 
-                         leagues=LEAGUES, 
-                         seasons=SEASONS, 
-                         data_types=DATA_TYPES)
+    status, body, headers = index_payload(request.headers.get("Accept-Encoding", ""),
+                                          request.headers.get("If-None-Match", ""))
+    return Response(body, status=status, mimetype="text/html", headers=headers)
+
+
+def fast_index_wsgi(wsgi_app):
+    """Answer GET / with the pre-rendered page without going through Flask dispatch."""
+    def wrapper(environ, start_response):
+        if environ.get("PATH_INFO") == "/" and environ.get("REQUEST_METHOD") == "GET":
+            status, body, headers = index_payload(environ.get("HTTP_ACCEPT_ENCODING", ""),
+                                                  environ.get("HTTP_IF_NONE_MATCH", ""))
+            if status == 304:
+                start_response("304 Not Modified", list(headers.items()))
+                return []
+            start_response("200 OK", [
+                ("Content-Type", "text/html; charset=utf-8"),
+                ("Content-Length", str(len(body))),
+                *headers.items(),
+            ])
+            return [body]
+        return wsgi_app(environ, start_response)
+    return wrapper
+
+
+app.wsgi_app = fast_index_wsgi(app.wsgi_app)
 
 
 @app.route("/api/teams", methods=["GET"])
@@ -189,92 +643,96 @@ def get_teams():
     season = request.args.get("season", "2324")
     
     teams = get_teams_for_league(league, season)
-    return jsonify({"teams": teams})
+    response = json_response({"teams": teams})
+    
+    # Team lists change rarely; let the browser revalidate instead of refetching.
+    # An empty list may be a scrape failure, so that is never cached.
+    if teams:
+        response.set_etag(hashlib.sha1(response.get_data()).hexdigest())
+        response.cache_control.public = True
+        response.cache_control.max_age = 3600
+        response = response.make_conditional(request)
+    return response
 
 
 @app.route("/api/stats", methods=["GET"])
 def get_stats_options():
     """Return available stat types for a data type."""
     data_type = request.args.get("data_type", "team")
-    if data_type in DATA_TYPES:
-        return jsonify(DATA_TYPES[data_type]["stats"])
-    return jsonify([])
+    return Response(_STATS_JSON.get(data_type, b"[]"),
+                    mimetype="application/json",
+                    headers={"Cache-Control": "public, max-age=3600"})
+
+
+def prepare_data(data: dict):
+    """Fetch the frame described by a preview/download request body.
+
+    Returns the DataFrame as fetched, still with its MultiIndex, and a CSV filename for it.
+    """
+    leagues = data.get("leagues", ["epl"])
+    seasons = data.get("seasons", ["2324"])
+    data_type = data.get("data_type", "team")
+    stat_type = data.get("stat_type", "standard")
+    teams = data.get("teams", [])
+    columns = data.get("columns")
+    
+    df = fetch_data(data_type, leagues, seasons, stat_type, teams if teams else None, columns)
+    
+    # Generate filename
+    leagues_str = "_".join(leagues)
+    seasons_str = "_".join(seasons)
+    stat_str = f"_{stat_type}" if data_type in ["team", "player", "player_match"] else ""
+    teams_str = f"_{'_'.join(teams[:2])}" if teams else ""
+    filename = f"{data_type}_{leagues_str}_{seasons_str}{stat_str}{teams_str}.csv"
+    
+    return df, filename
 
 
 @app.route("/api/preview", methods=["POST"])
 def preview_data():
     """Preview the first few rows of data."""
     try:
-        data = request.json
-        leagues = data.get("leagues", ["epl"])
-        seasons = data.get("seasons", ["2324"])
-        data_type = data.get("data_type", "team")
-        stat_type = data.get("stat_type", "standard")
-        teams = data.get("teams", [])
-        
-        df = fetch_data(data_type, leagues, seasons, stat_type, teams if teams else None)
-        
-        # Flatten multi-level columns for display
-        pd = get_pandas()
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [' - '.join(col).strip(' - ') for col in df.columns.values]
-        
-        # Reset index for JSON serialization
-        df = df.reset_index()
+        df, _ = prepare_data(request.json)
         
-        preview = df.head(20).to_dict(orient="records")
-        columns = list(df.columns)
+        # Only the preview rows need flattening and an index reset
+        total_rows = len(df)
+        head = reset_index(flatten_columns(df.head(PREVIEW_ROWS)))
+        columns = list(head.columns)
         
-        return jsonify({
+        # The rows go straight from pandas to JSON text, without Python dicts in between
+        body = dumps_json_with({
             "success": True,
-            "preview": preview,
             "columns": columns,
-            "total_rows": len(df),
+            "total_rows": total_rows,
             "total_cols": len(columns)
-        })
+        }, preview=preview_json(head))
+        return Response(body, mimetype="application/json")
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+        return json_response({"success": False, "error": str(e)}, status=400)
 
 
 @app.route("/api/download", methods=["POST"])
 def download_data():
     """Download data as CSV."""
     try:
-        data = request.json
-        leagues = data.get("leagues", ["epl"])
-        seasons = data.get("seasons", ["2324"])
-        data_type = data.get("data_type", "team")
-        stat_type = data.get("stat_type", "standard")
-        teams = data.get("teams", [])
-        
-        df = fetch_data(data_type, leagues, seasons, stat_type, teams if teams else None)
-        
-        # Flatten multi-level columns
-        pd = get_pandas()
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [' - '.join(col).strip(' - ') for col in df.columns.values]
-        
-        df = df.reset_index()
-        
-        # Generate filename
-        leagues_str = "_".join(leagues)
-        seasons_str = "_".join(seasons)
-        stat_str = f"_{stat_type}" if data_type in ["team", "player", "player_match"] else ""
-        teams_str = f"_{'_'.join(teams[:2])}" if teams else ""
-        filename = f"{data_type}_{leagues_str}_{seasons_str}{stat_str}{teams_str}.csv"
+        df, filename = prepare_data(request.json)
+        df = flatten_columns(df)
+        # to_csv writes index levels as leading columns, so the frame is never reset
+        write_index = not isinstance(df.index, get_pandas().RangeIndex)
         
-        # Convert to CSV
-        output = StringIO()
-        df.to_csv(output, index=False)
-        csv_content = output.getvalue()
+        # Stream the CSV in row chunks instead of building it in one buffer
+        def generate():
+            yield df.iloc[:0].to_csv(index=write_index)
+            for start in range(0, len(df), CSV_CHUNK_ROWS):
+                yield df.iloc[start:start + CSV_CHUNK_ROWS].to_csv(index=write_index, header=False)
         
         return Response(
-            csv_content,
+            generate(),
             mimetype="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+        return json_response({"success": False, "error": str(e)}, status=400)
 
 
 @app.route("/api/fetch-progress", methods=["POST"])
@@ -286,64 +744,57 @@ def fetch_with_progress():
     data_type = data.get("data_type", "team")
     stat_type = data.get("stat_type", "standard")
     teams = data.get("teams", [])
+    selected_columns = data.get("columns")
     
     def generate():
         try:
             # Stage 1: Initializing
-            yield f"data: {json.dumps({'stage': 'init', 'progress': 5, 'message': 'Initializing scraper...'})}\n\n"
+            yield sse_event({'stage': 'init', 'progress': 5, 'message': 'Initializing scraper...'})
             time.sleep(0.3)
             
             # Stage 2: Connecting
-            yield f"data: {json.dumps({'stage': 'connect', 'progress': 15, 'message': 'Connecting to FBref...'})}\n\n"
-            fbref = get_fbref_scraper(leagues, seasons)
+            yield sse_event({'stage': 'connect', 'progress': 15, 'message': 'Connecting to FBref...'})
             
             # Stage 3: Fetching
-            yield f"data: {json.dumps({'stage': 'fetch', 'progress': 30, 'message': f'Fetching {data_type} data...'})}\n\n"
+            yield sse_event({'stage': 'fetch', 'progress': 30, 'message': f'Fetching {data_type} data...'})
             
-            if data_type == "team":
-                df = fbref.read_team_season_stats(stat_type=stat_type or "standard")
-            elif data_type == "player":
-                yield f"data: {json.dumps({'stage': 'fetch', 'progress': 40, 'message': 'Fetching player stats (this may take a moment)...'})}\n\n"
-                df = fbref.read_player_season_stats(stat_type=stat_type or "standard")
-            elif data_type == "schedule":
-                df = fbref.read_schedule()
+            if data_type == "player":
+                yield sse_event({'stage': 'fetch', 'progress': 40, 'message': 'Fetching player stats (this may take a moment)...'})
             elif data_type == "player_match":
-                yield f"data: {json.dumps({'stage': 'fetch', 'progress': 40, 'message': 'Fetching match-level stats (this may take a while)...'})}\n\n"
-                df = fbref.read_player_match_stats(stat_type=stat_type or "summary")
+                yield sse_event({'stage': 'fetch', 'progress': 40, 'message': 'Fetching match-level stats (this may take a while)...'})
+            df = fetch_cached(data_type, tuple(leagues), tuple(seasons), stat_type)
             
-            yield f"data: {json.dumps({'stage': 'process', 'progress': 70, 'message': 'Processing data...'})}\n\n"
+            yield sse_event({'stage': 'process', 'progress': 70, 'message': 'Processing data...'})
             
             # Filter by teams
             if teams and len(teams) > 0:
                 df = filter_by_teams(df, teams)
             
-            yield f"data: {json.dumps({'stage': 'format', 'progress': 85, 'message': 'Formatting results...'})}\n\n"
+            if selected_columns:
+                df = select_columns(df, selected_columns)
             
-            # Flatten multi-level columns
-            pd = get_pandas()
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = [' - '.join(col).strip(' - ') for col in df.columns.values]
+            yield sse_event({'stage': 'format', 'progress': 85, 'message': 'Formatting results...'})
             
-            df = df.reset_index()
+            # Only the preview rows need flattening and an index reset
+            total_rows = len(df)
+            df = reset_index(flatten_columns(df.head(PREVIEW_ROWS)))
             
-            yield f"data: {json.dumps({'stage': 'complete', 'progress': 100, 'message': 'Complete!'})}\n\n"
+            yield sse_event({'stage': 'complete', 'progress': 100, 'message': 'Complete!'})
             
-            # Final result
-            preview = df.head(20).to_dict(orient="records")
+            # Final result, with the rows serialized by pandas as in /api/preview
             columns = list(df.columns)
             
             result = {
                 "stage": "done",
                 "success": True,
-                "preview": preview,
                 "columns": columns,
-                "total_rows": len(df),
+                "total_rows": total_rows,
                 "total_cols": len(columns)
             }
-            yield f"data: {json.dumps(result)}\n\n"
+            yield sse_event(result, preview=preview_json(df))
             
         except Exception as e:
-            yield f"data: {json.dumps({'stage': 'error', 'success': False, 'error': str(e)})}\n\n"
+            yield sse_event({'stage': 'error', 'success': False, 'error': str(e)})
     
     return Response(
         stream_with_context(generate()),
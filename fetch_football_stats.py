@@ -14,6 +14,7 @@ Supported Leagues:
 import argparse
 import soccerdata as sd
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -52,6 +53,10 @@ PLAYER_STAT_TYPES = [
     "keeper_adv",
 ]
 
+# Upper bound on concurrent (league, season) scrapes. Each scraper rate-limits
+# only itself, so the limits add up; FBref bans clients above ~20 requests/min.
+MAX_WORKERS = 2
+
 
 def get_fbref_scraper(leagues: list[str], seasons: list[str]) -> sd.FBref:
     """
@@ -64,7 +69,8 @@ def get_fbref_scraper(leagues: list[str], seasons: list[str]) -> sd.FBref:
     Returns:
         FBref scraper instance
     """
-    league_ids = [LEAGUES[lg.lower()] for lg in leagues if lg.lower() in LEAGUES]
+    keys = [lg.lower() for lg in leagues]
+    league_ids = [LEAGUES[key] for key in keys if key in LEAGUES]
 
     if not league_ids:
         raise ValueError(
@@ -74,6 +80,32 @@ def get_fbref_scraper(leagues: list[str], seasons: list[str]) -> sd.FBref:
     return sd.FBref(leagues=league_ids, seasons=seasons)
 
 
+def fetch_parallel(leagues: list[str], seasons: list[str], read) -> pd.DataFrame:
+    """
+    Run a read for each (league, season) pair concurrently and combine the results.
+
+    Args:
+        leagues: List of league keys
+        seasons: List of seasons
+        read: Function taking an FBref scraper and returning a DataFrame
+
+    Returns:
+        Concatenated DataFrame, sorted by index like a single multi-league read
+    """
+    leagues = [lg for lg in leagues if lg.lower() in LEAGUES]
+    pairs = [(league, season) for league in leagues for season in seasons]
+    if len(pairs) <= 1:
+        return read(get_fbref_scraper(leagues, seasons))
+
+    def read_pair(pair):
+        league, season = pair
+        return read(get_fbref_scraper([league], [season]))
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pairs))) as executor:
+        frames = list(executor.map(read_pair, pairs))
+    return pd.concat(frames).sort_index()
+
+
 def fetch_team_stats(
     leagues: list[str], seasons: list[str], stat_type: str = "standard"
 ) -> pd.DataFrame:
@@ -88,8 +120,9 @@ def fetch_team_stats(
     Returns:
         DataFrame with team statistics
     """
-    fbref = get_fbref_scraper(leagues, seasons)
-    return fbref.read_team_season_stats(stat_type=stat_type)
+    return fetch_parallel(
+        leagues, seasons, lambda fbref: fbref.read_team_season_stats(stat_type=stat_type)
+    )
 
 
 def fetch_player_stats(
@@ -106,8 +139,9 @@ def fetch_player_stats(
     Returns:
         DataFrame with player statistics
     """
-    fbref = get_fbref_scraper(leagues, seasons)
-    return fbref.read_player_season_stats(stat_type=stat_type)
+    return fetch_parallel(
+        leagues, seasons, lambda fbref: fbref.read_player_season_stats(stat_type=stat_type)
+    )
 
 
 def fetch_schedule(leagues: list[str], seasons: list[str]) -> pd.DataFrame:
@@ -121,8 +155,7 @@ def fetch_schedule(leagues: list[str], seasons: list[str]) -> pd.DataFrame:
     Returns:
         DataFrame with match schedule
     """
-    fbref = get_fbref_scraper(leagues, seasons)
-    return fbref.read_schedule()
+    return fetch_parallel(leagues, seasons, lambda fbref: fbref.read_schedule())
 
 
 def fetch_player_match_stats(
@@ -139,8 +172,9 @@ def fetch_player_match_stats(
     Returns:
         DataFrame with player match statistics
     """
-    fbref = get_fbref_scraper(leagues, seasons)
-    return fbref.read_player_match_stats(stat_type=stat_type)
+    return fetch_parallel(
+        leagues, seasons, lambda fbref: fbref.read_player_match_stats(stat_type=stat_type)
+    )
 
 
 def save_to_csv(df: pd.DataFrame, filename: str, output_dir: str = "output") -> str:
@@ -8,11 +8,11 @@ import soccerdata as sd
 import pandas as pd
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Output directory - save directly to web app's public folder
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "web", "public", "data")
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # Leagues to fetch
 LEAGUES = {
@@ -30,45 +30,41 @@ SEASONS = ["2324", "2223"]
 TEAM_STATS = ["standard", "shooting", "passing", "defense", "possession"]
 PLAYER_STATS = ["standard", "shooting", "passing", "defense", "keeper"]
 
+# Player stat types included in the export (a subset, to save time/space)
+EXPORTED_PLAYER_STATS = ["standard", "shooting", "passing"]
+
+# Leagues scraped at once. Each FBref instance rate-limits only itself, so
+# more workers multiply the request rate (FBref bans above ~20 requests/min).
+LEAGUE_WORKERS = 2
+
 
 def flatten_columns(df):
     """Flatten MultiIndex columns."""
     if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [' - '.join(str(c) for c in col).strip(' - ') for col in df.columns]
+        levels = [df.columns.get_level_values(i).astype(str) for i in range(df.columns.nlevels)]
+        df.columns = levels[0].str.cat(levels[1:], sep=' - ').str.strip(' - ')
     return df
 
 
 def df_to_json(df):
-    """Convert DataFrame to JSON-serializable format."""
-    df = flatten_columns(df.copy())
+    """Convert DataFrame to JSON-serializable format. Renames the caller's columns in place."""
+    df = flatten_columns(df)
     df = df.reset_index()
     # Convert timestamps to strings
-    for col in df.columns:
-        if df[col].dtype == 'datetime64[ns]' or 'datetime' in str(df[col].dtype):
-            df[col] = df[col].astype(str)
-    # Convert to records and handle NaN
-    records = df.where(pd.notnull(df), None).to_dict(orient='records')
-    # Clean up any remaining non-serializable objects
-    clean_records = []
-    for record in records:
-        clean_record = {}
-        for k, v in record.items():
-            if pd.isna(v) or v is None:
-                clean_record[k] = None
-            elif hasattr(v, 'isoformat'):  # datetime objects
-                clean_record[k] = str(v)
-            else:
-                clean_record[k] = v
-        clean_records.append(clean_record)
+    dt_cols = df.select_dtypes(include=["datetime", "datetimetz"]).columns
+    if len(dt_cols):
+        df[dt_cols] = df[dt_cols].astype(str)
+    # Object dtype lets NaN become None in every column, numeric ones included
+    df = df.astype(object).where(df.notna(), None)
+    clean_records = df.to_dict(orient='records')
     columns = list(df.columns)
     return {"columns": columns, "data": clean_records}
 
 
-def fetch_team_stats(league_id, league_name, season, stat_type):
+def fetch_team_stats(fbref, league_name, season, stat_type):
     """Fetch team stats for a league/season."""
-    print(f"  Fetching team {stat_type} stats...")
+    print(f"  [{league_name} {season}] Fetching team {stat_type} stats...")
     try:
-        fbref = sd.FBref(leagues=[league_id], seasons=[season])
         df = fbref.read_team_season_stats(stat_type=stat_type)
         return df_to_json(df)
     except Exception as e:
@@ -76,11 +72,10 @@ def fetch_team_stats(league_id, league_name, season, stat_type):
         return None
 
 
-def fetch_player_stats(league_id, league_name, season, stat_type):
+def fetch_player_stats(fbref, league_name, season, stat_type):
     """Fetch player stats for a league/season."""
-    print(f"  Fetching player {stat_type} stats...")
+    print(f"  [{league_name} {season}] Fetching player {stat_type} stats...")
     try:
-        fbref = sd.FBref(leagues=[league_id], seasons=[season])
         df = fbref.read_player_season_stats(stat_type=stat_type)
         return df_to_json(df)
     except Exception as e:
@@ -88,11 +83,10 @@ def fetch_player_stats(league_id, league_name, season, stat_type):
         return None
 
 
-def fetch_schedule(league_id, league_name, season):
+def fetch_schedule(fbref, league_name, season):
     """Fetch match schedule."""
-    print(f"  Fetching schedule...")
+    print(f"  [{league_name} {season}] Fetching schedule...")
     try:
-        fbref = sd.FBref(leagues=[league_id], seasons=[season])
         df = fbref.read_schedule()
         return df_to_json(df)
     except Exception as e:
@@ -100,6 +94,47 @@ def fetch_schedule(league_id, league_name, season):
         return None
 
 
+def fetch_league(league_key, league_id):
+    """Fetch every table for one league across all seasons."""
+    print(f"\n📊 {league_key.upper()}")
+    league_data = {"team_stats": {}, "player_stats": {}, "schedules": {}}
+    
+    for season in SEASONS:
+        print(f"\n  [{league_key}] Season: {season}")
+        key = f"{league_key}_{season}"
+        
+        league_data["team_stats"][key] = {}
+        league_data["player_stats"][key] = {}
+        
+        # One scraper per league/season, shared by all of its tables
+        try:
+            fbref = sd.FBref(leagues=[league_id], seasons=[season])
+        except Exception as e:
+            print(f"    Error: {e}")
+            continue
+        
+        # Tables are read one at a time so the scraper's rate limit holds;
+        # leagues already run in parallel in main()
+        # Team stats
+        for stat_type in TEAM_STATS:
+            data = fetch_team_stats(fbref, league_key, season, stat_type)
+            if data:
+                league_data["team_stats"][key][stat_type] = data
+        
+        # Player stats
+        for stat_type in EXPORTED_PLAYER_STATS:
+            data = fetch_player_stats(fbref, league_key, season, stat_type)
+            if data:
+                league_data["player_stats"][key][stat_type] = data
+        
+        # Schedule
+        schedule = fetch_schedule(fbref, league_key, season)
+        if schedule:
+            league_data["schedules"][key] = schedule
+    
+    return league_data
+
+
 def main():
     print("=" * 60)
     print("FBref Data Scraper")
@@ -116,38 +151,25 @@ def main():
         "schedules": {},
     }
     
-    for league_key, league_id in LEAGUES.items():
-        print(f"\n📊 {league_key.upper()}")
-        
-        for season in SEASONS:
-            print(f"\n  Season: {season}")
-            key = f"{league_key}_{season}"
-            
-            # Team stats
-            all_data["team_stats"][key] = {}
-            for stat_type in TEAM_STATS:
-                data = fetch_team_stats(league_id, league_key, season, stat_type)
-                if data:
-                    all_data["team_stats"][key][stat_type] = data
-            
-            # Player stats (only standard and shooting to save time/space)
-            all_data["player_stats"][key] = {}
-            for stat_type in PLAYER_STATS[:3]:  # standard, shooting, passing
-                data = fetch_player_stats(league_id, league_key, season, stat_type)
-                if data:
-                    all_data["player_stats"][key][stat_type] = data
-            
-            # Schedule
-            schedule = fetch_schedule(league_id, league_key, season)
-            if schedule:
-                all_data["schedules"][key] = schedule
+    # Leagues are independent, so scrape a few of them concurrently
+    with ThreadPoolExecutor(max_workers=min(LEAGUE_WORKERS, len(LEAGUES))) as executor:
+        futures = [
+            executor.submit(fetch_league, league_key, league_id)
+            for league_key, league_id in LEAGUES.items()
+        ]
+        # Merge in LEAGUES order so the output layout stays stable
+        for future in futures:
+            for section, entries in future.result().items():
+                all_data[section].update(entries)
     
     # Save to JSON
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
     output_file = os.path.join(OUTPUT_DIR, "football_data.json")
     print(f"\n💾 Saving to {output_file}...")
     
     with open(output_file, 'w') as f:
-        json.dump(all_data, f)
+        # Compact separators: the file is bundled into the site, not read by hand
+        json.dump(all_data, f, separators=(',', ':'))
     
     # Also save a smaller metadata file
     meta_file = os.path.join(OUTPUT_DIR, "metadata.json")
@@ -1,6 +1,7 @@
 import streamlit as st
-import soccerdata as sd
-import pandas as pd
+import io
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 
 st.set_page_config(
     page_title="Football Stats Lab",
@@ -44,7 +45,7 @@ LEAGUES = {
     "Ligue 1 🇫🇷": "FRA-Ligue 1",
 }
 
-SEASONS = ["2324", "2223", "2122", "2021"]
+SEASONS = ("2324", "2223", "2122", "2021")
 SEASON_LABELS = {
     "2324": "2023-24",
     "2223": "2022-23",
@@ -70,6 +71,18 @@ STAT_TYPES = {
     }
 }
 
+# Widget options, built once instead of on every rerun
+LEAGUE_NAMES = tuple(LEAGUES)
+DATA_TYPES = ("Team Stats", "Player Stats", "Schedule")
+STAT_TYPE_KEYS = {data_type: tuple(stats) for data_type, stats in STAT_TYPES.items()}
+
+# Rows per slice when encoding large CSV exports in parallel
+CSV_CHUNK_ROWS = 20000
+
+# Preview table limits
+PREVIEW_ROWS = 100
+PREVIEW_MAX_COLUMNS = 50
+
 # Sidebar
 with st.sidebar:
     st.header("📊 Settings")
@@ -77,7 +90,7 @@ with st.sidebar:
     # League selection
     selected_league = st.selectbox(
         "Select League",
-        options=list(LEAGUES.keys()),
+        options=LEAGUE_NAMES,
         index=0
     )
     
@@ -85,27 +98,35 @@ with st.sidebar:
     selected_season = st.selectbox(
         "Select Season",
         options=SEASONS,
-        format_func=lambda x: SEASON_LABELS[x],
+        format_func=SEASON_LABELS.__getitem__,
         index=0
     )
     
     # Data type
     data_type = st.radio(
         "Data Type",
-        options=["Team Stats", "Player Stats", "Schedule"],
+        options=DATA_TYPES,
         index=0
     )
     
     # Stat type (if applicable)
-    if data_type in ["Team Stats", "Player Stats"]:
+    if data_type in STAT_TYPES:
         stat_type = st.selectbox(
             "Stat Type",
-            options=list(STAT_TYPES[data_type].keys()),
-            format_func=lambda x: STAT_TYPES[data_type][x]
+            options=STAT_TYPE_KEYS[data_type],
+            format_func=STAT_TYPES[data_type].__getitem__
         )
     else:
         stat_type = None
     
+    # Download format
+    download_format = st.selectbox(
+        "Download Format",
+        options=["CSV", "Parquet"],
+        index=0,
+        help="Parquet files are smaller and faster to load in pandas, Polars or DuckDB"
+    )
+    
     st.divider()
     
     # Fetch button
@@ -113,10 +134,39 @@ with st.sidebar:
 
 
 # Main content
-@st.cache_data(ttl=3600, show_spinner=False)
-def fetch_data(league_id, season, data_type, stat_type):
+@st.cache_resource(show_spinner=False)
+def get_soccerdata():
+    """Import soccerdata on first use; it pulls in lxml and its league configs"""
+    import soccerdata
+    return soccerdata
+
+
+def flatten_columns(df):
+    """Flatten multi-index columns into 'Level 0 - Level 1' names"""
+    if df.columns.nlevels > 1:
+        levels = [df.columns.get_level_values(i).astype(str) for i in range(df.columns.nlevels)]
+        df.columns = levels[0].str.cat(levels[1:], sep=' - ').str.strip(' - ')
+    return df
+
+
+def shrink_dtypes(df):
+    """Downcast integer stats and store repeated labels as categoricals"""
+    import pandas as pd
+    for col in df.select_dtypes("int64").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.select_dtypes(["object", "string"]).columns:
+        if df[col].nunique() <= len(df) // 2:
+            df[col] = df[col].astype("category")
+    return df
+
+
+# Persisted to disk so restarts skip FBref. Streamlit ignores ttl for persisted
+# caches, so the cache_day argument rolls entries over once a day instead, and
+# roll_over_caches() deletes the previous days' entries.
+@st.cache_data(persist="disk", show_spinner=False)
+def fetch_data(league_id, season, data_type, stat_type, cache_day):
     """Fetch data from FBref"""
-    fbref = sd.FBref(leagues=[league_id], seasons=[season])
+    fbref = get_soccerdata().FBref(leagues=[league_id], seasons=[season])
     
     if data_type == "Team Stats":
         df = fbref.read_team_season_stats(stat_type=stat_type)
@@ -125,52 +175,194 @@ def fetch_data(league_id, season, data_type, stat_type):
     else:  # Schedule
         df = fbref.read_schedule()
     
-    # Flatten multi-index columns
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [' - '.join(str(c) for c in col).strip(' - ') for col in df.columns]
+    return shrink_dtypes(flatten_columns(df).reset_index())
+
+
+def pandas_text(df):
+    """Render non-integer columns as the strings df.to_csv writes, with missing values as nulls"""
+    import pandas as pd
+    df = df.copy(deep=False)
+    for col, dtype in zip(df.columns, df.dtypes):
+        if not pd.api.types.is_integer_dtype(dtype):
+            df[col] = df[col].astype(str).where(df[col].notna(), None)
+    return df
+
+
+def encode_csv(df):
+    """CSV bytes from Arrow's C++ writer, byte-for-byte what df.to_csv(index=False) writes"""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return df.to_csv(index=False).encode("utf-8")
+    
+    header = df.head(0).to_csv(index=False).encode("utf-8")
+    options = pacsv.WriteOptions(include_header=False, quoting_style="none")
     
-    return df.reset_index()
+    def write(table):
+        buf = io.BytesIO()
+        pacsv.write_csv(table, buf, write_options=options)
+        return buf.getvalue()
+    
+    try:
+        # pandas formats dates, booleans and floats itself; Arrow only lays out the rows.
+        # Its header is always quoted, so pandas writes that line too.
+        table = pa.Table.from_pandas(pandas_text(df), preserve_index=False)
+        if table.num_rows <= CSV_CHUNK_ROWS:
+            return header + write(table)
+        
+        # Large tables: encode row slices on threads (the writer releases the GIL)
+        chunks = [table.slice(start, CSV_CHUNK_ROWS) for start in range(0, table.num_rows, CSV_CHUNK_ROWS)]
+        with ThreadPoolExecutor() as executor:
+            return header + b"".join(executor.map(write, chunks))
+    except pa.ArrowException:
+        # Values with commas, quotes or newlines need pandas' minimal quoting
+        return df.to_csv(index=False).encode("utf-8")
+
+
+def encode_parquet(df):
+    """Parquet bytes from Arrow's columnar writer"""
+    buf = io.BytesIO()
+    df.to_parquet(buf, engine="pyarrow", compression="zstd", index=False)
+    return buf.getvalue()
+
+
+# Download formats: encoder, file extension, MIME type
+EXPORT_FORMATS = {
+    "CSV": (encode_csv, "csv", "text/csv"),
+    "Parquet": (encode_parquet, "parquet", "application/vnd.apache.parquet"),
+}
+
+
+@st.cache_data(persist="disk", show_spinner=False)
+def fetch_export(league_id, season, data_type, stat_type, cache_day, file_format):
+    """Full-table export of fetch_data, encoded once per set of fetch arguments"""
+    encode = EXPORT_FORMATS[file_format][0]
+    return encode(fetch_data(league_id, season, data_type, stat_type, cache_day))
+
 
+# Column subsets can be endless, so their exports stay in memory and off disk
+@st.cache_data(max_entries=16, show_spinner=False)
+def fetch_export_columns(league_id, season, data_type, stat_type, cache_day, file_format, columns):
+    """Export of a column subset of fetch_data"""
+    encode = EXPORT_FORMATS[file_format][0]
+    df = fetch_data(league_id, season, data_type, stat_type, cache_day)
+    return encode(df[list(columns)])
+
+
+@st.cache_data(persist="disk", show_spinner=False)
+def filled_on():
+    """Day the persisted caches were filled; persisted so it survives restarts with them"""
+    return date.today().isoformat()
+
+
+def roll_over_caches(today):
+    """Delete earlier days' cache entries, which no cache_day key can hit again"""
+    if filled_on() != today:
+        for cached in (fetch_data, fetch_export, fetch_export_columns, filled_on):
+            cached.clear()
+        filled_on()
+
+
+# max_entries=1: each new day's entry replaces the previous one
+@st.cache_resource(max_entries=1, show_spinner=False)
+def start_prefetch(cache_day):
+    """Warm fetch_data for the default sidebar selection, once per process and day"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.submit(fetch_data, LEAGUES[LEAGUE_NAMES[0]], SEASONS[0], DATA_TYPES[0], STAT_TYPE_KEYS[DATA_TYPES[0]][0], cache_day)
+    # The submitted fetch still runs; this only lets the worker thread exit after it
+    executor.shutdown(wait=False)
+    return True
+
+
+roll_over_caches(date.today().isoformat())
+start_prefetch(date.today().isoformat())
 
 # Display data
 if fetch_button:
     league_id = LEAGUES[selected_league]
+    cache_day = date.today().isoformat()
     
     with st.spinner(f"Fetching {data_type.lower()} for {selected_league}..."):
         try:
-            df = fetch_data(league_id, selected_season, data_type, stat_type)
-            
-            # Stats
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Rows", f"{len(df):,}")
-            with col2:
-                st.metric("Columns", len(df.columns))
-            with col3:
-                st.metric("League", selected_league.split()[0])
-            
-            st.divider()
+            df = fetch_data(league_id, selected_season, data_type, stat_type, cache_day)
             
-            # Data table
-            st.dataframe(df, use_container_width=True, height=500)
-            
-            # Download button
-            csv = df.to_csv(index=False)
-            filename = f"{data_type.lower().replace(' ', '_')}_{selected_season}_{stat_type or 'schedule'}.csv"
-            
-            st.download_button(
-                label="📥 Download CSV",
-                data=csv,
-                file_name=filename,
-                mime="text/csv",
-                type="primary"
-            )
+            # Keep the result so reruns from other widgets (e.g. downloading) still show it
+            st.session_state["last_fetch"] = {
+                "args": (league_id, selected_season, data_type, stat_type, cache_day),
+                "league": selected_league,
+                "df": df,
+            }
             
         except Exception as e:
+            st.session_state.pop("last_fetch", None)
             st.error(f"Error fetching data: {str(e)}")
             st.info("Try selecting a different league/season combination.")
 
-else:
+last_fetch = st.session_state.get("last_fetch")
+if last_fetch:
+    league_id, season, fetched_type, fetched_stat, cache_day = last_fetch["args"]
+    df = last_fetch["df"]
+    
+    # Stats
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Rows", f"{len(df):,}")
+    with col2:
+        st.metric("Columns", len(df.columns))
+    with col3:
+        st.metric("League", last_fetch["league"].split()[0])
+    
+    st.divider()
+    
+    # Columns kept in both the preview and the download
+    selected_columns = st.multiselect(
+        "Columns to include",
+        options=list(df.columns),
+        default=list(df.columns)
+    )
+    # None means every column: full exports use the persisted cache
+    export_columns = None if selected_columns == list(df.columns) else tuple(selected_columns)
+    
+    # Data table: a bounded preview of the selected columns
+    preview_columns = selected_columns[:PREVIEW_MAX_COLUMNS]
+    st.dataframe(df.head(PREVIEW_ROWS)[preview_columns], use_container_width=True, height=500)
+    if len(df) > PREVIEW_ROWS or len(selected_columns) > len(preview_columns):
+        st.caption(
+            f"Previewing {min(len(df), PREVIEW_ROWS)} of {len(df):,} rows and "
+            f"{len(preview_columns)} of {len(selected_columns)} selected columns"
+        )
+    
+    # Download: encode only when asked, not on every rerun
+    export_key = (last_fetch["args"], download_format, export_columns)
+    if not selected_columns:
+        st.warning("Select at least one column to download.")
+    elif st.button(f"📦 Prepare {download_format}"):
+        basename = f"{fetched_type.lower().replace(' ', '_')}_{season}_{fetched_stat or 'schedule'}"
+        _, extension, mime = EXPORT_FORMATS[download_format]
+        filename = f"{basename}.{extension}"
+        try:
+            if export_columns:
+                data = fetch_export_columns(
+                    league_id, season, fetched_type, fetched_stat, cache_day, download_format, export_columns
+                )
+            else:
+                data = fetch_export(league_id, season, fetched_type, fetched_stat, cache_day, download_format)
+            st.session_state["export"] = {"key": export_key, "data": data, "filename": filename, "mime": mime}
+        except Exception as e:
+            st.error(f"Error preparing download: {str(e)}")
+    
+    export = st.session_state.get("export")
+    if selected_columns and export and export["key"] == export_key:
+        st.download_button(
+            label=f"📥 Download {download_format}",
+            data=export["data"],
+            file_name=export["filename"],
+            mime=export["mime"],
+            type="primary"
+        )
+
+elif not fetch_button:
     # Welcome message
     st.info("👈 Select options in the sidebar and click **Fetch Data** to get started!")
     